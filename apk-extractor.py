@@ -1,9 +1,44 @@
 import sys
 import subprocess
 import os
+import queue
+import shutil
 import time
 import re
-import zipfile
+from collections import deque
+
+# Resolve the adb binary once at import time instead of letting a shell
+# re-search PATH on every invocation.
+_ADB = shutil.which("adb")
+
+# On Windows, suppress the console window that would otherwise flash up
+# for every adb call.
+_SUBPROCESS_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+# Matches the "[ 42%] /path/to/file" progress lines adb emits during pull
+_PULL_PROGRESS_RE = re.compile(rb"\[\s*(\d+)%\]")
+
+# Line printed by the on-device script when extraction succeeds
+_APK_EXTRACTED_RE = re.compile(r"APK Extracted: (.+\.apk)")
+
+def _parse_adb_devices(stdout):
+    # One pass over 'adb devices' output -> {serial: status}; every consumer
+    # classifies from this dict instead of re-running regexes per line
+    devices = {}
+    for line in stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1] in ("device", "unauthorized", "offline"):
+            devices[parts[0]] = parts[1]
+    return devices
+
+
+def _format_adb_command(command):
+    # Human-readable form of a command for the log, covering both argv
+    # lists and ("shell", cmdline) tuples
+    if isinstance(command, tuple):
+        return f"adb shell {command[1]}"
+    return " ".join(command)
 
 # --- START PyQt6 Dependency Check ---
 try:
@@ -14,8 +49,8 @@ try:
         QSpacerItem, QSizePolicy, QProgressBar, QCheckBox,
         QDialog
     )
-    from PyQt6.QtGui import QFont, QColor, QTextCharFormat, QTextCursor, QPainter, QBrush, QPen, QGuiApplication
-    from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize
+    from PyQt6.QtGui import QFont, QColor, QTextCharFormat, QTextCursor, QPainter, QBrush, QPen, QGuiApplication, QStandardItemModel, QStandardItem
+    from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QSortFilterProxyModel
 except ImportError:
     # If PyQt6 is not found, try to display a basic message and exit
     # This part needs to be very basic as PyQt6 itself might not be available
@@ -26,16 +61,31 @@ except ImportError:
 # --- END PyQt6 Dependency Check ---
 
 
+# Substrings (lowercased) that mark a pull failure as file-not-found
+_ADB_NOTFOUND_TOKENS = ("no such file", "does not exist")
+
+# QTextCharFormat per log color, built once; only a handful of colors are
+# ever used, so this keeps Qt object construction off the log hot path
+_FORMAT_CACHE = {}
+
+# Log-message kinds carried on the log_message signals; an int compare in
+# the handler replaces sniffing the message text for a prefix
+_LOG_OUTPUT = 0
+_LOG_COMMAND = 1
+
+
 # QThread class to run ADB commands in the background
 class WorkerThread(QThread):
     finished = pyqtSignal(str, str, int, float)
     error = pyqtSignal(str)
     progress_update = pyqtSignal(int)
-    log_message = pyqtSignal(str, str) # Used for internal debug logs, not for public UI logs
+    log_message = pyqtSignal(str, str, int) # (message, color, kind) for internal debug logs, not public UI logs
 
     def __init__(self, command, measure_time=False, is_download=False):
         super().__init__()
-        self.command = command
+        # command is an argv list/tuple, e.g. ["adb", "devices"]; the bare
+        # "adb" entry is swapped for the cached absolute path in run().
+        self.command = list(command)
         self.measure_time = measure_time
         self.is_download = is_download
         self.process = None # Initialize process as None
@@ -44,29 +94,37 @@ class WorkerThread(QThread):
         start_time = time.time()
         try:
             # This log_message is for internal worker only, not displayed in the initial UI dialog
-            # self.log_message.emit(f"Executing command: {self.command}", "purple")
+            # self.log_message.emit(f"Executing command: {self.command}", "purple", _LOG_COMMAND)
+            argv = self.command
+            if argv and argv[0] == "adb":
+                if _ADB is None:
+                    raise FileNotFoundError("adb")
+                argv = [_ADB] + argv[1:]
+            if self.is_download:
+                self._run_streaming(argv, start_time)
+                return
+            # Binary pipes with the OS default buffer: communicate() does one
+            # big read to EOF, so line buffering / incremental decoding would
+            # only add per-byte bookkeeping. Decode once at the end instead.
             self.process = subprocess.Popen(
-                self.command,
-                shell=True,
+                argv,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                bufsize=1
+                bufsize=-1,
+                creationflags=_SUBPROCESS_FLAGS
             )
 
-            stdout_lines = []
-            stderr_lines = []
-
             stdout_data, stderr_data = self.process.communicate()
 
-            stdout_lines.append(stdout_data)
-            stderr_lines.append(stderr_data)
-
             end_time = time.time()
             time_taken = end_time - start_time
 
-            self.finished.emit("".join(stdout_lines), "".join(stderr_lines), self.process.returncode, time_taken)
+            self.finished.emit(
+                stdout_data.decode('utf-8', 'replace'),
+                stderr_data.decode('utf-8', 'replace'),
+                self.process.returncode,
+                time_taken
+            )
 
         except FileNotFoundError:
             self.error.emit("Error: ADB command not found. Make sure ADB is installed and in your PATH.")
@@ -76,6 +134,250 @@ class WorkerThread(QThread):
             if self.process and self.process.poll() is None:
                 self.process.kill()
 
+    def _run_streaming(self, argv, start_time):
+        # Download path: consume output incrementally so progress reaches the
+        # UI while the transfer is still running, instead of buffering the
+        # whole stream to EOF. adb writes its "[ 42%] ..." progress updates
+        # to stderr separated by carriage returns, so merge the streams and
+        # split on both \r and \n.
+        self.process = subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            creationflags=_SUBPROCESS_FLAGS
+        )
+
+        output_lines = []
+        pending = b""
+        last_percent = -1
+        while True:
+            chunk = self.process.stdout.read(4096)
+            if not chunk:
+                break
+            pending += chunk
+            lines = pending.replace(b"\r", b"\n").split(b"\n")
+            pending = lines.pop() # Keep the trailing partial line for next read
+            for raw_line in lines:
+                # Progress lines are pure ASCII, so match on the raw bytes
+                # and only decode the (rare) non-progress output lines
+                match = _PULL_PROGRESS_RE.search(raw_line)
+                if match:
+                    percent = int(match.group(1))
+                    if percent != last_percent:
+                        last_percent = percent
+                        self.progress_update.emit(percent)
+                elif raw_line:
+                    output_lines.append(raw_line.decode('utf-8', 'replace'))
+
+        if pending:
+            output_lines.append(pending.decode('utf-8', 'replace'))
+
+        returncode = self.process.wait()
+        self.finished.emit("\n".join(output_lines), "", returncode, time.time() - start_time)
+
+# One long-lived 'adb -s <serial> shell' process for small device-side
+# commands. Each one-shot 'adb shell ...' invocation pays a client fork
+# plus a daemon/device handshake; streaming commands through a single
+# shell with a sentinel marker amortizes that to one handshake per
+# session. Only used from the AdbService worker thread.
+class PersistentAdbShell:
+    _MARKER = b"__APKEXTRACT_RC__"
+
+    def __init__(self, serial):
+        self.serial = serial
+        argv = [_ADB, "-s", serial, "shell"] if serial else [_ADB, "shell"]
+        self._process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            creationflags=_SUBPROCESS_FLAGS
+        )
+
+    def alive(self):
+        return self._process.poll() is None
+
+    def run(self, command):
+        # Execute one device-side command line; returns (output, returncode).
+        # The sentinel echo carries the exit status back and delimits output.
+        self._process.stdin.write((command + '; echo "' + self._MARKER.decode() + '$?"\n').encode('utf-8'))
+        self._process.stdin.flush()
+
+        output_lines = []
+        returncode = 0
+        while True:
+            line = self._process.stdout.readline()
+            if not line:
+                raise BrokenPipeError("adb shell session closed unexpectedly")
+            line = line.rstrip(b"\r\n")
+            marker_index = line.find(self._MARKER)
+            if marker_index != -1:
+                # Output not ending in a newline runs into the marker line
+                if marker_index > 0:
+                    output_lines.append(line[:marker_index])
+                try:
+                    returncode = int(line[marker_index + len(self._MARKER):])
+                except ValueError:
+                    returncode = 0
+                break
+            output_lines.append(line)
+        return b"\n".join(output_lines).decode('utf-8', 'replace'), returncode
+
+    def close(self):
+        if self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process.terminate()
+        self._process.wait()
+
+# Single long-lived thread that executes queued adb commands.
+# Short adb calls (devices/connect/disconnect/shell/...) used to spawn a
+# fresh WorkerThread each, i.e. one new OS thread per 2-second poll. This
+# service owns one thread and a command queue instead; callers submit an
+# argv list plus callbacks and results are delivered back on the GUI
+# thread via queued signals.
+class AdbService(QThread):
+    command_finished = pyqtSignal(int, str, str, int, float)
+    command_finished_raw = pyqtSignal(int, bytes, bytes, int, float)
+    command_error = pyqtSignal(int, str)
+    # Emitted when the persistent shell dies twice in a row, which means
+    # the device itself is gone rather than a transient hiccup
+    device_lost = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._next_reply_id = 0
+        self._callbacks = {} # reply_id -> (on_finished, on_error)
+        self._shell = None # PersistentAdbShell, only touched by the worker thread
+        self._shell_serial = None
+        # Queued connections hop the results back onto the GUI thread
+        self.command_finished.connect(self._dispatch_finished)
+        self.command_finished_raw.connect(self._dispatch_finished)
+        self.command_error.connect(self._dispatch_error)
+
+    def submit(self, command, on_finished, on_error=None, raw=False, timeout=None):
+        # Queue a command; on_finished(stdout, stderr, returncode,
+        # time_taken) or on_error(message) runs later on the GUI thread.
+        # command is either an argv list (one-shot adb process) or a
+        # ("shell", cmdline) tuple routed through the persistent device
+        # shell. With raw=True the output is delivered as undecoded bytes,
+        # for callers that parse ASCII adb output on a hot path. timeout
+        # (seconds) kills a hung one-shot command and reports it through
+        # on_error; it does not apply to shell-routed commands.
+        self._next_reply_id += 1
+        reply_id = self._next_reply_id
+        self._callbacks[reply_id] = (on_finished, on_error)
+        if isinstance(command, tuple) and command[0] == "shell":
+            self._queue.put((reply_id, command, raw, None))
+        else:
+            self._queue.put((reply_id, list(command), raw, timeout))
+        return reply_id
+
+    def set_device(self, serial):
+        # Retarget (or with None, tear down) the persistent device shell;
+        # processed on the worker thread so the shell is never touched from
+        # two threads.
+        self._queue.put(("set_device", serial))
+
+    def stop(self):
+        self._queue.put(None)
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._close_shell()
+                break
+            if item[0] == "set_device":
+                self._shell_serial = item[1]
+                self._close_shell()
+                continue
+            reply_id, command, raw, timeout = item
+            start_time = time.time()
+            try:
+                if isinstance(command, tuple):
+                    stdout, returncode = self._run_in_shell(command[1])
+                    self.command_finished.emit(
+                        reply_id, stdout, "", returncode,
+                        time.time() - start_time
+                    )
+                    continue
+                argv = command
+                if argv and argv[0] == "adb":
+                    if _ADB is None:
+                        raise FileNotFoundError("adb")
+                    argv = [_ADB] + argv[1:]
+                # run() kills and reaps the child itself when the timeout
+                # expires, then raises TimeoutExpired
+                result = subprocess.run(
+                    argv,
+                    capture_output=True,
+                    timeout=timeout,
+                    creationflags=_SUBPROCESS_FLAGS
+                )
+                if raw:
+                    self.command_finished_raw.emit(
+                        reply_id,
+                        result.stdout,
+                        result.stderr,
+                        result.returncode,
+                        time.time() - start_time
+                    )
+                else:
+                    self.command_finished.emit(
+                        reply_id,
+                        result.stdout.decode('utf-8', 'replace'),
+                        result.stderr.decode('utf-8', 'replace'),
+                        result.returncode,
+                        time.time() - start_time
+                    )
+            except FileNotFoundError:
+                self.command_error.emit(reply_id, "Error: ADB command not found. Make sure ADB is installed and in your PATH.")
+            except subprocess.TimeoutExpired:
+                self.command_error.emit(reply_id, f"Command timed out after {timeout}s: {_format_adb_command(command)}")
+            except Exception as e:
+                self.command_error.emit(reply_id, f"An error occurred while running the command: {e}")
+
+    def _run_in_shell(self, cmdline):
+        # Lazily (re)spawn the persistent shell, retrying once on a broken
+        # session (device replug, adb server restart, ...)
+        if _ADB is None:
+            raise FileNotFoundError("adb")
+        for attempt in (1, 2):
+            if self._shell is None or not self._shell.alive():
+                self._close_shell()
+                self._shell = PersistentAdbShell(self._shell_serial)
+            try:
+                return self._shell.run(cmdline)
+            except (BrokenPipeError, OSError):
+                self._close_shell()
+                if attempt == 2:
+                    self.device_lost.emit()
+                    raise
+
+    def _close_shell(self):
+        if self._shell is not None:
+            try:
+                self._shell.close()
+            except OSError:
+                pass
+            self._shell = None
+
+    def _dispatch_finished(self, reply_id, stdout, stderr, returncode, time_taken):
+        callbacks = self._callbacks.pop(reply_id, None)
+        if callbacks:
+            callbacks[0](stdout, stderr, returncode, time_taken)
+
+    def _dispatch_error(self, reply_id, message):
+        callbacks = self._callbacks.pop(reply_id, None)
+        if callbacks and callbacks[1]:
+            callbacks[1](message)
+
 # Class for blinking connection indicator
 class ConnectionIndicator(QWidget):
     def __init__(self, parent=None):
@@ -83,9 +385,14 @@ class ConnectionIndicator(QWidget):
         self.setFixedSize(QSize(10, 10))
         self._color = QColor("red")
         self.animation_timer = QTimer(self)
+        self.animation_timer.setTimerType(Qt.TimerType.CoarseTimer)
         self.animation_timer.timeout.connect(self._animate_dot)
         self.current_alpha = 255
         self.is_on = True
+        # Reused across paintEvents; rebuilding them per blink allocated two
+        # Qt objects per frame
+        self._pen = QPen(Qt.PenStyle.NoPen)
+        self._brush = QBrush(self._color)
 
         self.set_status("disconnected")
 
@@ -95,14 +402,16 @@ class ConnectionIndicator(QWidget):
         self.current_alpha = 255
 
         if status == "connected":
+            # Steady solid dot; no point waking up every second to blink a
+            # state that isn't changing.
             self._color = QColor("#00ff00")
-            self.animation_timer.start(1000) # Blinks slowly every 1 second
         elif status == "connecting":
             self._color = QColor("#ffa500")
             self.animation_timer.start(400)
         elif status == "disconnected":
             self._color = QColor("#d6184f")
             self.animation_timer.start(200)
+        self._brush = QBrush(self._color)
         self.update()
 
     def _animate_dot(self):
@@ -111,14 +420,13 @@ class ConnectionIndicator(QWidget):
         self.update()
 
     def paintEvent(self, event):
+        if not self.is_on:
+            # Off phase of the blink: nothing to draw at all
+            return
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        color_with_alpha = QColor(self._color)
-        color_with_alpha.setAlpha(self.current_alpha)
-
-        painter.setBrush(QBrush(color_with_alpha))
-        painter.setPen(QPen(Qt.PenStyle.NoPen))
+        painter.setBrush(self._brush)
+        painter.setPen(self._pen)
         painter.drawEllipse(0, 0, self.width(), self.height())
 
 # Initial Connection Dialog for ADB
@@ -128,8 +436,9 @@ class InitialConnectionDialog(QDialog):
     # Signal to notify MainWindow about ADB check status (is_connected, device_id)
     adb_status_checked = pyqtSignal(bool, str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, adb_service=None):
         super().__init__(parent)
+        self.adb_service = adb_service
         self.setWindowTitle("Waiting for ADB Connection")
 
         # Calculate screen center for dialog positioning
@@ -143,21 +452,23 @@ class InitialConnectionDialog(QDialog):
         self.setModal(True)
 
         self.adb_available = False
+        self._poll_interval = 2000 # Starting poll interval, grows while idle
         self.check_timer = QTimer(self) # Timer for automatic checks
-        self.check_timer.setInterval(2000) # Check every 2 seconds
+        # Coarse timers avoid raising the global timer resolution on Windows
+        self.check_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.check_timer.setInterval(self._poll_interval) # Check every 2 seconds
         self.check_timer.timeout.connect(self._check_adb_connection)
 
-        # Timer for loading dots animation
-        self.loading_dot_timer = QTimer(self)
-        self.loading_dot_timer.setInterval(500) # Update dots every 500ms
-        self.loading_dot_timer.timeout.connect(self._animate_loading_dots)
+        # Loading dots animation: self-rescheduling singleShot chain instead
+        # of an always-running interval timer (see _schedule_loading_dot).
         self.dot_count = 0
+        self._dot_pending = False
+
+        self._check_pending = False # True while an adb devices poll is queued
 
         self.init_ui()
         self._check_adb_availability_initial() # Initial ADB availability check
 
-        self.worker = None
-
     def init_ui(self):
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -185,10 +496,23 @@ class InitialConnectionDialog(QDialog):
         # Add another stretch to push content upwards, ensuring vertical centering
         layout.addStretch(1)
 
+    def _schedule_loading_dot(self):
+        # Only keep the animation chain alive while the dialog is actually
+        # visible; the chain halts itself on hide and resumes in showEvent.
+        if self.isVisible() and not self._dot_pending:
+            self._dot_pending = True
+            QTimer.singleShot(500, self._animate_loading_dots)
+
     def _animate_loading_dots(self):
         # Animate the loading dots
+        self._dot_pending = False
         self.dot_count = (self.dot_count + 1) % 4
         self.loading_dot_label.setText("Connecting" + "." * self.dot_count)
+        self._schedule_loading_dot()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_loading_dot()
 
 
     def update_status_message(self, text, color="black"):
@@ -206,24 +530,23 @@ class InitialConnectionDialog(QDialog):
 
 
     def _check_adb_availability_initial(self):
-        # Checks if ADB command is available on the system (only once at the beginning)
-        try:
-            subprocess.run("adb version", shell=True, capture_output=True, check=True)
+        # Checks if ADB command is available on the system (only once at the
+        # beginning). The PATH lookup already happened at import time, so no
+        # process needs to be spawned on the GUI thread here.
+        if _ADB is not None:
             self.adb_available = True
             self.update_status_message("<h1>Waiting for ADB Device Connection...</h1>"
                                        "<p>Ensure your Android device is connected via <b>USB</b> "
                                        "and <b>USB Debugging</b> is enabled.</p>"
                                        "<p>There might be an authorization prompt on your device. Please accept it.</p>", "#00ff00")
             self.check_timer.start() # Start timer if ADB is available
-            self.loading_dot_timer.start() # Start loading dots animation
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        else:
             self.adb_available = False
             self.update_status_message("<h1>CRITICAL: ADB Not Found!</h1>"
                                        "<p>ADB command not found. This application requires ADB.</p>"
                                        "<p>Please install <b>Android SDK Platform-Tools</b> and ensure ADB is in your system PATH.</p>"
                                        "<p>Download from: <a href='https://developer.android.com/studio/releases/platform-tools'>developer.android.com/studio/releases/platform-tools</a></p>", "red")
             self.check_timer.stop() # Stop timer if ADB is not available
-            self.loading_dot_timer.stop() # Stop loading dots animation
             # Consider showing a critical QMessageBox here and exiting if no ADB
             QMessageBox.critical(self, "ADB Not Found",
                                  "ADB command not found. This application will close. Please install Android SDK Platform-Tools.")
@@ -234,56 +557,85 @@ class InitialConnectionDialog(QDialog):
         if not self.adb_available:
             # If ADB is not available, the message has already been displayed in _check_adb_availability_initial
             return
+        if self._check_pending:
+            # Previous poll still queued/running; don't pile up commands
+            return
 
-        # Use WorkerThread to prevent UI freeze
-        self.worker = WorkerThread("adb devices")
-        self.worker.finished.connect(self._on_adb_check_finished)
-        self.worker.error.connect(self._on_worker_error)
-        # No need to connect log_message from worker to initial UI dialog anymore
-
-        self.worker.start()
-        self.loading_dot_timer.start() # Ensure dots animation is running during check
+        self._check_pending = True
+        self.adb_service.submit(["adb", "devices"], self._on_adb_check_finished, self._on_worker_error, raw=True)
 
     def _on_adb_check_finished(self, stdout, stderr, returncode, time_taken):
-        self.worker = None # Remove worker reference after completion
-        self.loading_dot_timer.stop() # Stop dots animation
-
-        is_connected_and_authorized = False
-        device_id_detected = "" # Initialize with empty string
-
-        # Look for lines indicating connected and 'device' status
-        # Prioritize Wi-Fi connection if available
-        wifi_device_status_match = re.search(r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d{1,5})\s+device", stdout)
-        usb_device_status_match = re.search(r"^[a-zA-Z0-9]+\s+device", stdout, re.MULTILINE)
+        self._check_pending = False
+
+        # Look for lines indicating connected and 'device' status.
+        # 'adb devices' output is fixed-format ASCII, so the poll stays on
+        # undecoded bytes and only the matched serial is decoded at the end.
+        # Prioritize Wi-Fi connection if available.
+        wifi_device_id = None
+        usb_device_id = None
+        for line in stdout.splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and parts[1] == b"device":
+                serial = parts[0]
+                if b":" in serial and serial[:1].isdigit():
+                    wifi_device_id = serial
+                    break
+                if usb_device_id is None:
+                    usb_device_id = serial
 
-        if wifi_device_status_match:
-            device_id_detected = wifi_device_status_match.group(1)
-            is_connected_and_authorized = True
-        elif usb_device_status_match:
-            device_id_detected = usb_device_status_match.group(0).split()[0]
-            is_connected_and_authorized = True
+        device_id_detected = (wifi_device_id or usb_device_id or b"").decode("ascii", "replace")
+        is_connected_and_authorized = bool(device_id_detected)
 
         if is_connected_and_authorized:
             self.update_status_message(f"<h1>ADB Connection Successful!</h1><p>Device detected and authorized: <b>{device_id_detected}</b></p><p>Main GUI will load shortly.</p>", "#00ff00")
             self.adb_status_checked.emit(True, device_id_detected)
+            self._poll_interval = 2000 # Reset back-off for any future polling
             self.check_timer.stop() # Stop timer
             QTimer.singleShot(1000, self.accept) # Close dialog after 1 second
         else:
+            # Back off while no device is present: 2s -> 4s -> 8s, capped at
+            # 10s, so an idle dialog stops waking the machine every 2 seconds.
+            self._poll_interval = min(self._poll_interval * 2, 10000)
+            self.check_timer.setInterval(self._poll_interval)
             self.update_status_message("<h1>Waiting for ADB Device Connection...</h1>"
                                        "<p>No device detected or unauthorized.</p>"
                                        "<p>Ensure device is connected via <b>USB</b>, <b>USB Debugging</b> is active, and authorization has been accepted.</p>", "orange")
             # If not connected or unauthorized, send empty ID
             self.adb_status_checked.emit(False, "")
-            self.loading_dot_timer.start() # Restart dots if still waiting
             # Timer will automatically trigger next check
 
     def _on_worker_error(self, message):
-        self.worker = None
-        self.loading_dot_timer.stop() # Stop dots animation on error
+        self._check_pending = False
         self.update_status_message(f"<h1>ERROR!</h1><p>{message}</p><p>Retrying...</p>", "red")
         self.adb_status_checked.emit(False, "") # Send empty ID if there's an error
         # Timer will automatically trigger next check
 
+class ApkFilterProxyModel(QSortFilterProxyModel):
+    """Filters the APK combo's model against display text or package name.
+
+    The casefolded "<display>\n<package name>" haystack is precomputed per
+    item at populate time, so a keystroke costs one substring test per row
+    in C++ driven Qt code rather than a Python rebuild of the combo.
+    """
+
+    CASEFOLD_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_filter_text(self, text):
+        self._needle = text.casefold()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        haystack = index.data(self.CASEFOLD_ROLE)
+        return haystack is not None and self._needle in haystack
+
+
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -294,25 +646,46 @@ class MainWindow(QWidget):
         self.connected_device_id = None # New attribute to store connected device ID
         self.apk_available = False
         self.last_extracted_apk_filename = None
-        self.all_apk_paths = []
+        # Parallel lists (structure-of-arrays): display text and package
+        # name for each installed package, in fetch order. The extract
+        # script takes a package name, so that is what gets stored; the
+        # display text is currently derived from it.
+        self._apk_display_names = []
+        self._apk_packages = []
+        # Log lines queued between event-loop turns; a burst of display_log
+        # calls is inserted in one edit block instead of one layout per line
+        self._log_queue = deque(maxlen=2000)
+        self._log_flush_pending = False
         self.debug_mode = False
         self.adb_available = False # Set by initial dialog
         self.total_download_size = 0
+        # Remote path -> size in bytes, filled by the batched stat and by
+        # single-path probes; lets a download reuse a known size
+        self._apk_size_cache = {}
+        # In-flight download setup: remote path, chosen local path and
+        # whether the size probe completed (see _maybe_launch_pull)
+        self._pending_pull = None
+        # Set per download in _launch_apk_pull; used by the progress slot
+        self._total_mb = 0.0
+        self._total_mb_str = "0.00MB"
         self.current_local_download_path = None
 
-        # Initialize attributes to store worker thread references
-        self.tcpip_worker = None
-        self.connect_ip_worker = None
-        self.devices_worker = None
-        self.disconnect_worker = None
-        self.transfer_worker = None
-        self.execute_worker = None
-        self.apk_list_worker = None
-        self.get_size_worker = None
+        # One persistent thread runs every short adb command; only the
+        # streaming download path still gets its own WorkerThread.
+        self.adb_service = AdbService(self)
+        self.adb_service.device_lost.connect(self._on_device_lost)
+        self.adb_service.start()
+        self._ui_refresh_pending = False
+        self._connect_ip_pending = False
+        self._devices_check_pending = False
         self.download_worker = None
+        # Short-TTL cache of slow, idempotent adb outputs keyed by command
+        # name -> (monotonic timestamp, stdout); invalidated on disconnect
+        # and tcpip changes
+        self._cmd_cache = {}
 
         # Display initial connection dialog
-        self.initial_dialog = InitialConnectionDialog(self)
+        self.initial_dialog = InitialConnectionDialog(self, self.adb_service)
         self.hide()
 
         # Initialize connection_indicator here, before dialog is executed
@@ -328,16 +701,14 @@ class MainWindow(QWidget):
             self.init_ui() # UI elements created here
             # After UI is created, call _update_button_states and _update_input_field_states
             # to reflect the initial connection status already stored in self.adb_connected
-            self._update_input_field_states()
-            self._update_button_states()
+            self._schedule_ui_refresh()
             self.show()
         else:
             # If dialog is rejected (closed without successful connection, or ADB not found), exit application
+            self.adb_service.stop()
+            self.adb_service.wait()
             sys.exit(0)
 
-        self.download_progress_timer = QTimer(self)
-        self.download_progress_timer.setInterval(200)
-        self.download_progress_timer.timeout.connect(self._update_download_progress)
 
     def _set_initial_adb_connected_state(self, is_connected, device_id):
         """
@@ -347,6 +718,8 @@ class MainWindow(QWidget):
         """
         self.adb_connected = is_connected
         self.connected_device_id = device_id if is_connected else None
+        if is_connected:
+            self.adb_service.set_device(device_id)
         if self.debug_mode:
             self.display_log(f"DEBUG: Initial ADB state received: {is_connected}, Device ID: {device_id}", "blue")
 
@@ -467,13 +840,27 @@ class MainWindow(QWidget):
 
         self.apk_filter_input = QLineEdit()
         self.apk_filter_input.setPlaceholderText("Filter APKs...")
-        self.apk_filter_input.textChanged.connect(self._filter_apk_paths)
+        # Debounce filtering so a typing burst triggers one combo rebuild
+        # instead of one per keystroke
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._filter_timer.timeout.connect(self._apply_apk_filter)
+        self.apk_filter_input.textChanged.connect(self._filter_timer.start)
         path_group_layout.addWidget(self.apk_filter_input, current_row, 0, 1, 3)
         current_row += 1
 
         apk_path_controls_layout = QHBoxLayout()
         self.apk_path_combo = QComboBox()
         self.apk_path_combo.setEditable(False)
+        # Explicit item model so repopulation is one bulk appendRows() and
+        # each item carries its package name as user data; a proxy model
+        # does the filtering so empty-filter resets never touch Python
+        self.apk_combo_model = QStandardItemModel(self.apk_path_combo)
+        self.apk_combo_proxy = ApkFilterProxyModel(self.apk_path_combo)
+        self.apk_combo_proxy.setSourceModel(self.apk_combo_model)
+        self.apk_path_combo.setModel(self.apk_combo_proxy)
         self.apk_path_combo.setPlaceholderText("/data/app/com.example.app-XYZ/base.apk")
         apk_path_controls_layout.addWidget(self.apk_path_combo)
 
@@ -508,6 +895,9 @@ class MainWindow(QWidget):
         self.log_output = QTextEdit()
         self.log_output.setReadOnly(True)
         self.log_output.setFont(QFont("Monospace", 10))
+        # Rolling cap so a verbose session can't grow the document (and its
+        # relayout cost) without bound
+        self.log_output.document().setMaximumBlockCount(2000)
         right_panel_layout.addWidget(self.log_output)
 
         self.download_progress_bar = QProgressBar(self)
@@ -523,9 +913,8 @@ class MainWindow(QWidget):
         # Initialize UI based on default selection (USB)
         self._update_connection_type_ui(self.connection_type_combo.currentIndex())
         self._update_script_mechanism_ui(self.script_mechanism_combo.currentIndex())
-        # Call _update_button_states() here to set initial button states
-        self._update_button_states()
-        self._update_input_field_states()
+        # Schedule the initial button/input state refresh
+        self._schedule_ui_refresh()
 
     def _update_connection_type_ui(self, index):
         # Index 0 is "USB", Index 1 is "Wi-Fi"
@@ -537,6 +926,42 @@ class MainWindow(QWidget):
         else:  # Wi-Fi selected
             self.ip_input.setVisible(True)
             self.enable_tcpip_btn.setVisible(True) # Show enable TCP/IP button
+        self._schedule_ui_refresh()
+
+    def _on_device_lost(self):
+        # The persistent shell could not be respawned: a dead session that
+        # won't come back means the device dropped off, so reset instead of
+        # leaving the UI claiming to be connected
+        if self.adb_connected:
+            self.display_log("Device appears to have disconnected.", "red")
+            self._reset_adb_state_and_ui()
+
+    def _handle_possible_disconnect(self, stderr, stdout=""):
+        # Connection liveness is tracked by observing real command failures
+        # instead of polling 'adb devices' in the background: if a command
+        # reports the device gone, drop straight to the disconnected state.
+        # Both streams are scanned because shell-routed commands and the
+        # streaming pull deliver their error text merged into stdout.
+        if not self.adb_connected:
+            return
+        error_lower = f"{stderr}\n{stdout}".lower()
+        if ("device offline" in error_lower
+                or "not found" in error_lower and "device" in error_lower
+                or "no devices/emulators found" in error_lower):
+            self.display_log("Device appears to have disconnected.", "red")
+            self._reset_adb_state_and_ui()
+
+    def _schedule_ui_refresh(self):
+        # Coalesce bursts of state changes into a single button/input
+        # recompute per event-loop turn; redundant setEnabled calls still
+        # cost Qt style work even when the value doesn't change.
+        if self._ui_refresh_pending:
+            return
+        self._ui_refresh_pending = True
+        QTimer.singleShot(0, self._do_ui_refresh)
+
+    def _do_ui_refresh(self):
+        self._ui_refresh_pending = False
         self._update_button_states()
         self._update_input_field_states()
 
@@ -549,9 +974,9 @@ class MainWindow(QWidget):
             self.connection_indicator.set_status("connected")
         else:
             # Check if IP is entered for Wi-Fi, for "connecting" status
-            if connection_type == "Wi-Fi" and self.ip_input.text().strip() and self.connect_ip_worker is not None and self.connect_ip_worker.isRunning():
+            if connection_type == "Wi-Fi" and self.ip_input.text().strip() and self._connect_ip_pending:
                 self.connection_indicator.set_status("connecting")
-            elif connection_type == "USB" and self.devices_worker is not None and self.devices_worker.isRunning():
+            elif connection_type == "USB" and self._devices_check_pending:
                 self.connection_indicator.set_status("connecting")
             else:
                 self.connection_indicator.set_status("disconnected")
@@ -577,7 +1002,6 @@ class MainWindow(QWidget):
             self.download_apk_btn.setEnabled(is_adb_ready and self.apk_available and self.last_extracted_apk_filename is not None)
 
         self.refresh_apk_btn.setEnabled(is_adb_ready)
-        self._update_input_field_states()
 
     def _update_input_field_states(self):
         is_connected = self.adb_connected
@@ -595,17 +1019,8 @@ class MainWindow(QWidget):
         ip = self.ip_input.text().strip()
 
         if connection_type == "Wi-Fi" and ip:
-            disconnect_command = f"adb disconnect {ip}"
             self.display_log(f"Attempting to disconnect ADB from {ip}...", "#00face")
-            # Execute disconnect command in worker thread and store its reference
-            self.disconnect_worker = WorkerThread(disconnect_command)
-            self.disconnect_worker.finished.connect(
-                lambda stdout, stderr, returncode, time_taken:
-                    self._on_disconnect_finished(stdout, stderr, returncode, time_taken)
-            )
-            self.disconnect_worker.error.connect(self.on_worker_error)
-            self.disconnect_worker.log_message.connect(self._handle_worker_log_message)
-            self.disconnect_worker.start()
+            self.adb_service.submit(["adb", "disconnect", ip], self._on_disconnect_finished, self.on_worker_error)
         else:
             # If USB or no IP for Wi-Fi, just reset status
             self.display_log("ADB disconnection (for USB or no IP) initiated.", "#00face")
@@ -618,14 +1033,15 @@ class MainWindow(QWidget):
             self.display_log(f"Failed to disconnect ADB: {stderr}", "red")
         # Reset ADB status and update UI after disconnect command finishes
         self._reset_adb_state_and_ui()
-        # Remove reference to worker after completion for garbage collection
-        self.disconnect_worker = None
 
     def _reset_adb_state_and_ui(self):
         # This function is responsible for resetting internal status and updating the UI
         # It will NOT close the application.
         self.adb_connected = False
         self.connected_device_id = None # Reset connected device ID
+        self.adb_service.set_device(None) # Tear down the persistent shell
+        self._cmd_cache.clear() # Cached outputs are stale once disconnected
+        self._apk_size_cache.clear()
         self.apk_available = False
         self.last_extracted_apk_filename = None
         self.connection_indicator.set_status("disconnected")
@@ -634,25 +1050,13 @@ class MainWindow(QWidget):
         self.download_progress_bar.setValue(0)
 
         # --- START FIX: Clear APK dropdown and data on disconnect ---
-        self.all_apk_paths = []
-        self.apk_path_combo.clear()
+        self._apk_display_names = []
+        self._apk_packages = []
+        self.apk_combo_model.clear()
         self.apk_path_combo.setPlaceholderText("/data/app/com.example.app-XYZ/base.apk")
         # --- END FIX ---
 
-        self._update_button_states()
-        self._update_input_field_states()
-
-    def _check_adb_availability(self):
-        # This function is now only used for logging in Mainwindow after initial_dialog completes
-        try:
-            subprocess.run("adb version", shell=True, capture_output=True, check=True)
-            self.adb_available = True
-            self.display_log("ADB found. Ready to communicate with Android devices.", "#c0ffee")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.adb_available = False
-            self.display_log("Warning: ADB not found. Please install Android SDK Platform-Tools and ensure ADB is in your PATH.", "orange")
-            self.display_log("Download: developer.android.com/studio/releases/platform-tools", "orange")
-
+        self._schedule_ui_refresh()
 
     def _update_script_mechanism_ui(self, index):
         if index == 0:  # Push Script & Run
@@ -661,9 +1065,8 @@ class MainWindow(QWidget):
             self.run_script_btn.setVisible(False)
             self.remote_script_label.setText("Target Storage Path:")
             self.remote_script_path_input.setPlaceholderText("/data/local/tmp/extract-apk.sh")
-            if self.remote_script_path_input.text() == "/data/local/tmp/extract-apk.sh" or \
-               self.remote_script_path_input.text() == "/data/local/tmp/extract-apk.sh" or \
-               not self.remote_script_path_input.text():
+            current_remote_path = self.remote_script_path_input.text()
+            if not current_remote_path or current_remote_path == "/data/local/tmp/extract-apk.sh":
                 self.remote_script_path_input.setText("/data/local/tmp/extract-apk.sh")
         else:  # Run Device Script
             self.local_script_widgets.setVisible(False)
@@ -673,7 +1076,7 @@ class MainWindow(QWidget):
             self.remote_script_path_input.setPlaceholderText("/data/local/tmp/extract-apk.sh")
             self.remote_script_path_input.setText("/data/local/tmp/extract-apk.sh")
             self.local_script_path_input.clear()
-        self._update_button_states()
+        self._schedule_ui_refresh()
 
     def browse_local_script_path(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Select extract-apk.sh Script", "", "Shell Scripts (*.sh);;All Files (*)")
@@ -683,16 +1086,51 @@ class MainWindow(QWidget):
             self.remote_script_path_input.setText(f"/data/local/tmp/{script_name}")
 
     def display_log(self, text, color="black"):
+        self._log_queue.append((text, color))
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            QTimer.singleShot(0, self._flush_log)
+
+    def _flush_log(self):
+        self._log_flush_pending = False
+        if not self._log_queue:
+            return
+        # While the window is hidden, let lines pool in the queue instead of
+        # paying text layout nobody sees; showEvent flushes the backlog. The
+        # queue's maxlen matches the document's block cap, so old lines fall
+        # off the same way they would in the widget.
+        if not self.log_output.isVisible():
+            return
         cursor = self.log_output.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
-        format = QTextCharFormat()
-        format.setForeground(QColor(color))
-        cursor.insertText(text + "\n", format)
-        self.log_output.setTextCursor(cursor)
-        self.log_output.verticalScrollBar().setValue(self.log_output.verticalScrollBar().maximum())
-
-    def _handle_worker_log_message(self, message, color):
-        if self.debug_mode or not message.startswith("Executing command:"):
+        # One edit block means one document layout pass for the whole burst
+        cursor.beginEditBlock()
+        while self._log_queue:
+            text, color = self._log_queue.popleft()
+            format = _FORMAT_CACHE.get(color)
+            if format is None:
+                format = QTextCharFormat()
+                format.setForeground(QColor(color))
+                _FORMAT_CACHE[color] = format
+            cursor.insertText(text + "\n", format)
+        cursor.endEditBlock()
+        # Scrolling a hidden widget is wasted layout work; the text is still
+        # appended and will be visible once the log is shown again
+        if self.log_output.isVisible():
+            self.log_output.setTextCursor(cursor)
+            self.log_output.verticalScrollBar().setValue(self.log_output.verticalScrollBar().maximum())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Catch up on anything logged while the window was hidden
+        if self._log_queue and not self._log_flush_pending:
+            self._log_flush_pending = True
+            QTimer.singleShot(0, self._flush_log)
+
+    def _handle_worker_log_message(self, message, color, kind=_LOG_OUTPUT):
+        # Command echoes are only shown in debug mode; the kind flag makes
+        # that an int compare instead of a prefix check on every message
+        if self.debug_mode or kind != _LOG_COMMAND:
             self.display_log(message, color)
 
     def _toggle_debug_mode(self, checked):
@@ -703,36 +1141,41 @@ class MainWindow(QWidget):
             self.display_log("Debug mode disabled (logs will be cleaner).", "dark#c0ffee")
 
     def _build_adb_command(self, action, ip=None, local_path=None, remote_path=None, apk_path_or_package_name=None):
-        base_command = ""
         # Use self.connected_device_id if available
-        device_target_arg = ""
+        device_target_args = []
         if self.connected_device_id:
-            device_target_arg = f"-s {self.connected_device_id}"
+            device_target_args = ["-s", self.connected_device_id]
         # If not Wi-Fi and self.connected_device_id is not set, but an IP is provided (e.g., for tcpip), use that
         elif ip and action != "test_connection_devices": # adb devices should not have -s
-            device_target_arg = f"-s {ip}"
+            device_target_args = ["-s", ip]
 
         if action == "connect_tcpip":
             # adb tcpip command should NOT use -s <ip>, it configures the *currently connected USB device*.
             # It should ideally use the currently detected USB device ID, but `adb tcpip` implicitly uses it.
             # So, we don't prepend -s for this specific command.
-            return f"adb tcpip {ip.split(':')[-1] if ':' in ip else '5555'}"
+            return ["adb", "tcpip", ip.split(':')[-1] if ':' in ip else '5555']
         elif action == "connect_ip":
-            return f"adb connect {ip}"
+            return ["adb", "connect", ip]
         elif action == "test_connection_devices":
-            return f"adb devices" # No -s here, as we are listing all devices
+            return ["adb", "devices"] # No -s here, as we are listing all devices
         elif action == "transfer":
-            base_command = f"adb {device_target_arg} push \"{local_path}\" \"{remote_path}\""
+            return ["adb"] + device_target_args + ["push", local_path, remote_path]
         elif action == "execute":
-            base_command = f"adb {device_target_arg} shell \"chmod +x '{remote_path}' && '{remote_path}' '{apk_path_or_package_name}'\""
+            # ("shell", ...) commands stream through the persistent device
+            # shell held by AdbService; the string is parsed device-side
+            return ("shell", f"chmod +x '{remote_path}' && '{remote_path}' '{apk_path_or_package_name}'")
         elif action == "list_apks":
-            base_command = f"adb {device_target_arg} shell \"pm list packages -f\""
+            return ("shell", "pm list packages -f")
         elif action == "get_apk_size": # New command to get APK size
-            base_command = f"adb {device_target_arg} shell \"stat -c %s '{apk_path_or_package_name}'\""
+            return ("shell", f"stat -c %s '{apk_path_or_package_name}'")
+        elif action == "get_apk_sizes":
+            # One stat over every path: N sizes for a single shell round trip
+            quoted = " ".join(f"'{p}'" for p in apk_path_or_package_name)
+            return ("shell", f"stat -c %s {quoted}")
         elif action == "download_apk":
-            base_command = f"adb {device_target_arg} pull \"{apk_path_or_package_name}\" \"{local_path}\""
+            return ["adb"] + device_target_args + ["pull", apk_path_or_package_name, local_path]
 
-        return base_command
+        return []
 
     def _enable_adb_tcpip(self):
         """
@@ -748,34 +1191,28 @@ class MainWindow(QWidget):
         self.connection_indicator.set_status("connecting")
 
         # First, check for a USB device to enable TCP/IP
-        self.check_usb_for_tcpip_worker = WorkerThread("adb devices")
-        self.check_usb_for_tcpip_worker.finished.connect(
+        ip = self.ip_input.text().strip()
+        self.adb_service.submit(
+            ["adb", "devices"],
             lambda stdout, stderr, returncode, time_taken:
-                self._on_usb_check_for_tcpip_for_tcpip_finished(stdout, stderr, returncode, time_taken, self.ip_input.text().strip())
+                self._on_usb_check_for_tcpip_for_tcpip_finished(stdout, stderr, returncode, time_taken, ip),
+            self.on_worker_error
         )
-        self.check_usb_for_tcpip_worker.error.connect(self.on_worker_error)
-        self.check_usb_for_tcpip_worker.start()
 
     def _on_usb_check_for_tcpip_for_tcpip_finished(self, stdout, stderr, returncode, time_taken, ip):
-        self.check_usb_for_tcpip_worker = None # Clear worker reference
 
-        usb_device_found = False
-        for line in stdout.splitlines():
-            # Check for any device listed as 'device' (connected and authorized)
-            if re.search(r"^[a-zA-Z0-9.:]+\s+device", line) and not re.search(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d{1,5}\s+device", line):
-                # Ensure it's a USB device, not a Wi-Fi connected one already
-                usb_device_found = True
-                break
+        devices = _parse_adb_devices(stdout)
+        # A serial without ':' is a USB device, not a Wi-Fi connected one
+        usb_device_found = any(
+            status == "device" and ":" not in serial
+            for serial, status in devices.items()
+        )
 
         if usb_device_found:
             self.display_log("USB device detected. Proceeding to enable ADB over TCP/IP.", "#c0ffee")
             # Proceed with Step 1: adb tcpip
-            self.tcpip_worker = WorkerThread(self._build_adb_command("connect_tcpip", ip=ip), measure_time=True)
             self.display_log(f"Running 'adb tcpip' command...", "#00face")
-            self.tcpip_worker.finished.connect(self._on_tcpip_finished)
-            self.tcpip_worker.error.connect(self.on_worker_error)
-            self.tcpip_worker.log_message.connect(self._handle_worker_log_message)
-            self.tcpip_worker.start()
+            self.adb_service.submit(self._build_adb_command("connect_tcpip", ip=ip), self._on_tcpip_finished, self.on_worker_error)
         else:
             self.display_log("No USB device found. To enable ADB over TCP/IP, you must first connect your Android device via USB and ensure USB Debugging is enabled and authorized.", "red")
             self.display_log("Please connect via USB first, then click 'Enable Wi-Fi ADB (USB)' again.", "orange")
@@ -808,15 +1245,14 @@ class MainWindow(QWidget):
         else: # Wi-Fi
             # For Wi-Fi, directly attempt 'adb connect IP'
             self.display_log(f"Attempting to connect to {ip} via Wi-Fi...", "#00face")
-            self.connect_ip_worker = WorkerThread(self._build_adb_command("connect_ip", ip=ip), measure_time=True)
-            self.connect_ip_worker.finished.connect(self._on_connect_ip_finished)
-            self.connect_ip_worker.error.connect(self.on_worker_error)
-            self.connect_ip_worker.log_message.connect(self._handle_worker_log_message)
-            self.connect_ip_worker.start()
+            self._connect_ip_pending = True
+            # 'adb connect' to an unreachable address can block for minutes
+            # on the TCP handshake; cap it
+            self.adb_service.submit(self._build_adb_command("connect_ip", ip=ip), self._on_connect_ip_finished, self.on_worker_error, timeout=30)
 
 
     def _on_tcpip_finished(self, stdout, stderr, returncode, time_taken):
-        self.tcpip_worker = None # Remove reference after completion
+        self._cmd_cache.pop("devices", None) # Transport mode just changed
         if returncode == 0 or "already in tcpip mode" in stdout.lower() or "restarting in TCP mode" in stdout.lower():
             self.display_log(f"ADB over TCP/IP enabled. (Time: {time_taken:.2f}s)", "#c0ffee")
             self.display_log("You can now disconnect USB and attempt Wi-Fi connection using 'Connect ADB' button.", "orange")
@@ -827,7 +1263,7 @@ class MainWindow(QWidget):
         self.connection_indicator.set_status("disconnected") # Since we're just enabling, not connecting fully
 
     def _on_connect_ip_finished(self, stdout, stderr, returncode, time_taken):
-        self.connect_ip_worker = None # Remove reference after completion
+        self._connect_ip_pending = False
         if returncode == 0 and ("connected to" in stdout.lower() or "already connected" in stdout.lower()):
             self.display_log(f"Successfully connected to {self.ip_input.text().strip()} via IP. (Time: {time_taken:.2f}s)", "#c0ffee")
             self._start_adb_devices_check() # Final check with adb devices to get device ID
@@ -840,14 +1276,22 @@ class MainWindow(QWidget):
 
     def _start_adb_devices_check(self):
         # Use regular adb devices command, without -s, to get a list of all devices
-        self.devices_worker = WorkerThread("adb devices", measure_time=True)
-        self.devices_worker.finished.connect(self.on_test_connection_finished)
-        self.devices_worker.error.connect(self.on_worker_error)
-        self.devices_worker.log_message.connect(self._handle_worker_log_message)
-        self.devices_worker.start()
+        cached = self._cmd_cache.get("devices")
+        if cached and time.monotonic() - cached[0] < 2.0:
+            self.on_test_connection_finished(cached[1], "", 0, 0.0)
+            return
+        self._devices_check_pending = True
+        self.adb_service.submit(["adb", "devices"], self._on_devices_fetched, self.on_worker_error)
+
+    def _on_devices_fetched(self, stdout, stderr, returncode, time_taken):
+        # Only real adb invocations land here; cache replays go straight to
+        # the handler, so a replay can never renew its own TTL
+        if returncode == 0:
+            self._cmd_cache["devices"] = (time.monotonic(), stdout)
+        self.on_test_connection_finished(stdout, stderr, returncode, time_taken)
 
     def on_test_connection_finished(self, stdout, stderr, returncode, time_taken):
-        self.devices_worker = None # Remove reference after completion
+        self._devices_check_pending = False
         self.display_log("Transmission Status", "#f7f5de")
         if stdout:
             self.display_log(stdout, "black")
@@ -857,38 +1301,30 @@ class MainWindow(QWidget):
         is_connected_and_authorized = False
         device_id_detected = None
 
-        # Look for devices with 'device' status (connected and authorized)
-        # Prioritize IP if available, then USB
-        for line in stdout.splitlines():
-            wifi_match = re.search(r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d{1,5})\s+device", line)
-            usb_match = re.search(r"^[a-zA-Z0-9]+\s+device", line)
+        devices = _parse_adb_devices(stdout)
 
-            if wifi_match:
-                device_id_detected = wifi_match.group(1)
-                is_connected_and_authorized = True
-                break
-            elif usb_match:
-                device_id_detected = usb_match.group(0).split()[0]
+        # First serial in 'device' state wins, matching adb's listing order
+        for serial, status in devices.items():
+            if status == "device":
+                device_id_detected = serial
                 is_connected_and_authorized = True
                 break
 
         # Check for "unauthorized" or "offline" status
         if not is_connected_and_authorized:
-            for line in stdout.splitlines():
-                unauthorized_match = re.search(r"(\S+)\s+unauthorized", line)
-                offline_match = re.search(r"(\S+)\s+offline", line)
-
-                if unauthorized_match:
-                    self.display_log(f"Device {unauthorized_match.group(1)} unauthorized. Please accept the RSA fingerprint on your Android device.", "red")
+            for serial, status in devices.items():
+                if status == "unauthorized":
+                    self.display_log(f"Device {serial} unauthorized. Please accept the RSA fingerprint on your Android device.", "red")
                     break
-                elif offline_match:
-                    self.display_log(f"Device {offline_match.group(1)} offline. Please check status/network.", "red")
+                elif status == "offline":
+                    self.display_log(f"Device {serial} offline. Please check status/network.", "red")
                     break
 
         if is_connected_and_authorized:
             self.display_log(f"ADB device online and authorized! ID: {device_id_detected} (Time: {time_taken:.2f}s)", "#c0ffee")
             self.adb_connected = True
             self.connected_device_id = device_id_detected # Store device ID
+            self.adb_service.set_device(device_id_detected) # Retarget the persistent shell
             self.apk_available = False
             self.last_extracted_apk_filename = None
             self.connection_indicator.set_status("connected")
@@ -925,8 +1361,7 @@ class MainWindow(QWidget):
         self.script_mechanism_combo.setEnabled(False)
 
     def _re_enable_all_buttons_and_inputs_after_operation(self):
-        self._update_button_states() # This will re-enable most buttons
-        self._update_input_field_states() # This will re-enable relevant inputs
+        self._schedule_ui_refresh() # Re-enables buttons and relevant inputs
         self.local_script_path_input.setReadOnly(False) # Ensure local script path is editable
         self.browse_local_script_btn.setEnabled(True)
         self.apk_filter_input.setEnabled(True) # Ensure filter is always active
@@ -945,7 +1380,7 @@ class MainWindow(QWidget):
         local_script = self.local_script_path_input.text()
 
         remote_script = self.remote_script_path_input.text().strip()
-        apk_path_or_package_name = self.apk_path_combo.currentData() # Use currentData() for actual APK path
+        apk_path_or_package_name = self._selected_apk_package() # Package name for the selection
 
         if not local_script or not os.path.exists(local_script):
             QMessageBox.warning(self, "Input Error", "Please select a valid extract-apk.sh script on your laptop.")
@@ -968,19 +1403,17 @@ class MainWindow(QWidget):
             "transfer", local_path=local_script, remote_path=remote_script
         )
 
-        self.display_log(f"Attempting to push script: {adb_push_command}", "#00face")
+        self.display_log(f"Attempting to push script: {' '.join(adb_push_command)}", "#00face")
 
-        self.transfer_worker = WorkerThread(adb_push_command)
-        self.transfer_worker.finished.connect(
+        self.adb_service.submit(
+            adb_push_command,
             lambda stdout, stderr, returncode, time_taken:
                 self._on_transfer_finished_and_then_run(
                     stdout, stderr, returncode, time_taken,
                     remote_script, apk_path_or_package_name
-                )
+                ),
+            self.on_worker_error
         )
-        self.transfer_worker.error.connect(self.on_worker_error)
-        self.transfer_worker.log_message.connect(self._handle_worker_log_message)
-        self.transfer_worker.start()
 
     def _on_transfer_finished_and_then_run(self, stdout, stderr, returncode, time_taken, remote_script, apk_path_or_package_name):
         self.display_log("Script Push Result", "#f7f5de")
@@ -995,18 +1428,13 @@ class MainWindow(QWidget):
 
         if returncode == 0:
             self.display_log("Script pushed successfully!", "#c0ffee")
-            self.transfer_worker = None # Remove reference after completion
             adb_execute_command = self._build_adb_command(
                 "execute", remote_path=remote_script, apk_path_or_package_name=apk_path_or_package_name
             )
 
-            self.display_log(f"Attempting to run script on Android: {adb_execute_command}", "#00face")
+            self.display_log(f"Attempting to run script on Android: {_format_adb_command(adb_execute_command)}", "#00face")
 
-            self.execute_worker = WorkerThread(adb_execute_command)
-            self.execute_worker.finished.connect(self.on_execute_finished)
-            self.execute_worker.error.connect(self.on_worker_error)
-            self.execute_worker.log_message.connect(self._handle_worker_log_message)
-            self.execute_worker.start()
+            self.adb_service.submit(adb_execute_command, self.on_execute_finished, self.on_worker_error)
         else:
             self.display_log(f"Script push failed with code {returncode}.", "red")
             self.display_log("Please ensure ADB is connected and the remote path exists and is writable.", "red")
@@ -1014,8 +1442,8 @@ class MainWindow(QWidget):
                 self.display_log("Permission denied on device. Check remote script path permissions.", "red")
             elif "No such file or directory" in stderr:
                 self.display_log("Remote destination directory on Android not found. Check Android script path.", "red")
+            self._handle_possible_disconnect(stderr, stdout)
             self._re_enable_all_buttons_and_inputs_after_operation()
-            self.transfer_worker = None # Remove reference if push fails
 
 
     def fetch_apk_paths(self):
@@ -1023,6 +1451,13 @@ class MainWindow(QWidget):
             QMessageBox.warning(self, "Connection Error", "Please connect to ADB first.")
             return
 
+        # Serve a recent listing from the cache: nothing changes on the
+        # device between two quick Refresh clicks
+        cached = self._cmd_cache.get("list_apks")
+        if cached and time.monotonic() - cached[0] < 5.0:
+            self.on_apk_paths_fetched(cached[1], "", 0, 0.0)
+            return
+
         # No need to pass IP to build_adb_command anymore as it uses self.connected_device_id
         adb_list_command = self._build_adb_command("list_apks")
 
@@ -1034,14 +1469,15 @@ class MainWindow(QWidget):
 
         self.display_log(f"Attempting to retrieve APK list from Android...", "#00face")
 
-        self.apk_list_worker = WorkerThread(adb_list_command)
-        self.apk_list_worker.finished.connect(self.on_apk_paths_fetched)
-        self.apk_list_worker.error.connect(self.on_worker_error)
-        self.apk_list_worker.log_message.connect(self._handle_worker_log_message)
-        self.apk_list_worker.start()
+        self.adb_service.submit(adb_list_command, self._on_apk_list_fetched, self.on_worker_error)
+
+    def _on_apk_list_fetched(self, stdout, stderr, returncode, time_taken):
+        # Same TTL rule as _on_devices_fetched: store only fresh results
+        if returncode == 0:
+            self._cmd_cache["list_apks"] = (time.monotonic(), stdout)
+        self.on_apk_paths_fetched(stdout, stderr, returncode, time_taken)
 
     def on_apk_paths_fetched(self, stdout, stderr, returncode, time_taken):
-        self.apk_list_worker = None # Remove reference after completion
         self.display_log("APK List Output", "#869ef8")
         if stdout:
             self.display_log(stdout, "#f7f5de")
@@ -1050,56 +1486,69 @@ class MainWindow(QWidget):
 
         if returncode == 0:
             self.display_log("APK list successfully retrieved!", "#c0ffee")
-            self.all_apk_paths = []
-            self.apk_path_combo.clear()
+            self._apk_display_names = []
+            self._apk_packages = []
 
             for line in stdout.splitlines():
-                match = re.search(r"package:(.+)=(.+)", line)
-                if match:
-                    package_name = match.group(1).strip()
-                    apk_path = match.group(2).strip()
-                    # Extract only filename for display
-                    apk_filename = os.path.basename(apk_path)
-                    # Display only APK filename for brevity
-                    display_text = apk_filename
-                    self.all_apk_paths.append((display_text, apk_path)) # Store as tuple (display_text, actual_path)
-                    self.apk_path_combo.addItem(display_text, apk_path) # Add to dropdown, store actual path as data
-
+                # Format is strictly package:<apk path>=<package name>; the
+                # separator is the last '=', so rpartition replaces the regex
+                if not line.startswith("package:"):
+                    continue
+                apk_path, sep, package_name = line[8:].rpartition("=")
+                if not sep or not apk_path or not package_name:
+                    continue
+                # The part after the '=' — the package name — is what gets
+                # displayed and what the extract script is given; the APK
+                # path before it is not used further
+                package_name = package_name.strip()
+                self._apk_display_names.append(package_name)
+                self._apk_packages.append(package_name)
+
+            self._populate_apk_combo(self._apk_display_names, self._apk_packages)
             self.apk_path_combo.setEditable(False)
         else:
             self.display_log(f"Failed to retrieve APK list with code {returncode}.", "red")
             self.display_log("Please ensure ADB is connected and authorized on your device.", "red")
-            if "Permission denied" in stderr or "error: device unauthorized" in stderr:
+            # The persistent shell merges stderr into stdout, so error text
+            # from shell-routed commands arrives in stdout
+            error_text = stderr or stdout
+            if "Permission denied" in error_text or "error: device unauthorized" in error_text:
                 self.display_log("Permission denied or device unauthorized. Accept the RSA fingerprint on your Android device.", "red")
-            elif "not found" in stderr:
+            elif "not found" in error_text:
                 self.display_log("`pm` command not found on device, or device not rooted/configured correctly.", "red")
+            self._handle_possible_disconnect(stderr, stdout)
 
         self._re_enable_all_buttons_and_inputs_after_operation()
         self.apk_path_combo.hidePopup()
 
-    def _filter_apk_paths(self, text):
-        self.apk_path_combo.blockSignals(True)
-        self.apk_path_combo.clear()
-        if text:
-            filtered_data = []
-            for display_filename, actual_apk_path_full in self.all_apk_paths:
-                # Filter by displayed filename or full APK path
-                if text.lower() in display_filename.lower() or text.lower() in actual_apk_path_full.lower():
-                    filtered_data.append((display_filename, actual_apk_path_full))
-
-            for display_text, apk_path in filtered_data:
-                self.apk_path_combo.addItem(display_text, apk_path)
-            if filtered_data:
-                self.apk_path_combo.showPopup()
-            else:
-                self.apk_path_combo.hidePopup()
+    def _apply_apk_filter(self):
+        # Filtering and the empty-text reset both happen inside the proxy
+        # model; no combo rebuild from Python either way
+        text = self.apk_filter_input.text()
+        self.apk_combo_proxy.set_filter_text(text)
+
+        if text and self.apk_combo_proxy.rowCount():
+            self.apk_path_combo.showPopup()
         else:
-            for display_text, apk_path in self.all_apk_paths:
-                self.apk_path_combo.addItem(display_text, apk_path)
             self.apk_path_combo.hidePopup()
 
+    def _populate_apk_combo(self, display_names, package_names):
+        # One bulk model insertion instead of one combo mutation per APK
+        self.apk_path_combo.blockSignals(True)
+        self.apk_combo_model.clear()
+        items = []
+        for display, package_name in zip(display_names, package_names):
+            item = QStandardItem(display)
+            item.setData(package_name, Qt.ItemDataRole.UserRole)
+            item.setData(f"{display}\n{package_name}".casefold(), ApkFilterProxyModel.CASEFOLD_ROLE)
+            items.append(item)
+        self.apk_combo_model.invisibleRootItem().appendRows(items)
         self.apk_path_combo.blockSignals(False)
 
+    def _selected_apk_package(self):
+        # The package name for the currently selected combo entry
+        return self.apk_path_combo.currentData(Qt.ItemDataRole.UserRole)
+
     def run_script_on_android(self):
         if not self.adb_connected:
             QMessageBox.warning(self, "Connection Error", "Please connect to ADB first.")
@@ -1109,7 +1558,7 @@ class MainWindow(QWidget):
             return
 
         remote_script = self.remote_script_path_input.text().strip()
-        apk_path_or_package_name = self.apk_path_combo.currentData()
+        apk_path_or_package_name = self._selected_apk_package()
 
         if not remote_script or not apk_path_or_package_name:
             QMessageBox.warning(self, "Input Error", "Please fill in Android Script Path and APK Path/Package Name.")
@@ -1125,16 +1574,11 @@ class MainWindow(QWidget):
         self.download_progress_bar.setVisible(False)
         self.download_progress_bar.setValue(0)
 
-        self.display_log(f"Attempting to run script on Android: {adb_execute_command}", "#00face")
+        self.display_log(f"Attempting to run script on Android: {_format_adb_command(adb_execute_command)}", "#00face")
 
-        self.execute_worker = WorkerThread(adb_execute_command)
-        self.execute_worker.finished.connect(self.on_execute_finished)
-        self.execute_worker.error.connect(self.on_worker_error)
-        self.execute_worker.log_message.connect(self._handle_worker_log_message)
-        self.execute_worker.start()
+        self.adb_service.submit(adb_execute_command, self.on_execute_finished, self.on_worker_error)
 
     def on_execute_finished(self, stdout, stderr, returncode, time_taken):
-        self.execute_worker = None # Remove reference after completion
         self.display_log("--- Script Execution Output ---", "#f7f5de")
         if stdout:
             self.display_log(stdout, "black")
@@ -1146,10 +1590,13 @@ class MainWindow(QWidget):
             self.display_log("The .apk file should have been extracted to the location expected by the script.", "#c0ffee")
             self.apk_available = True
 
-            match = re.search(r"APK Extracted: (.+\.apk)", stdout)
+            match = _APK_EXTRACTED_RE.search(stdout)
             if match:
                 self.last_extracted_apk_filename = match.group(1).strip()
                 self.display_log(f"APK filename detected: {self.last_extracted_apk_filename}", "#c0ffee")
+                # Stat the file now, off the critical path, so the later
+                # download can skip its pre-pull size probe
+                self._fetch_apk_sizes([self.last_extracted_apk_filename])
             else:
                 self.display_log("Warning: Could not automatically detect APK filename from script output. Please verify manually.", "orange")
                 self.last_extracted_apk_filename = None
@@ -1157,12 +1604,15 @@ class MainWindow(QWidget):
         else:
             self.display_log(f"Script execution failed with code {returncode}.", "red")
             self.display_log("Please check ADB connection, Android script path, and APK path/package name.", "red")
-            if "Permission denied" in stderr:
+            # Shell-routed command: its stderr is merged into stdout
+            error_text = stderr or stdout
+            if "Permission denied" in error_text:
                 self.display_log("Permission denied. Check script file permissions on Android.", "red")
-            elif "not found" in stderr:
+            elif "not found" in error_text:
                 self.display_log("Required script or command not found on Android device.", "red")
             self.apk_available = False
             self.last_extracted_apk_filename = None
+            self._handle_possible_disconnect(stderr, stdout)
 
         self._re_enable_all_buttons_and_inputs_after_operation()
 
@@ -1170,6 +1620,11 @@ class MainWindow(QWidget):
         """
         Processes multi-part APKs downloaded (APKS, XAPK, APKM) to extract base.apk.
         """
+        # Deferred imports: only the multi-part download path needs these,
+        # so keep them off the startup path.
+        import mmap
+        import zipfile
+
         self.display_log(f"INFO: Detecting multi-part APK: {os.path.basename(downloaded_file_path)}", "blue")
         extracted_base_apk_path = None
         try:
@@ -1178,25 +1633,44 @@ class MainWindow(QWidget):
             os.makedirs(extraction_dir, exist_ok=True)
             self.display_log(f"INFO: Creating extraction directory: {extraction_dir}", "blue")
 
-            with zipfile.ZipFile(downloaded_file_path, 'r') as zip_ref:
-                # List all files inside the archive to find base.apk
-                apk_files_in_archive = [f.filename for f in zip_ref.infolist() if f.filename.endswith('.apk')]
-
-                base_apk_found = False
-                for apk_in_archive in apk_files_in_archive:
-                    # Look for base.apk (or other primary APK if base.apk is not present)
-                    if os.path.basename(apk_in_archive) == "base.apk":
-                        self.display_log(f"INFO: Extracting base.apk from {os.path.basename(downloaded_file_path)}...", "blue")
-                        zip_ref.extract(apk_in_archive, extraction_dir)
-                        extracted_base_apk_path = os.path.join(extraction_dir, apk_in_archive)
-                        base_apk_found = True
-                        break # base.apk found, no need to check further
-
-                if base_apk_found:
-                    self.display_log(f"SUCCESS: base.apk extracted to: {extracted_base_apk_path}", "#c0ffee")
+            # Map the just-written bundle instead of handing zipfile a raw
+            # file: the backwards central-directory scan then reads mapped
+            # pages rather than issuing a seek+read syscall pair per probe.
+            # mmap only grew the full io interface (seekable() and friends,
+            # which ZipFile.open's shared-file wrapper relies on) in Python
+            # 3.13, so older versions use the plain file handle.
+            with open(downloaded_file_path, 'rb') as bundle_file:
+                if hasattr(mmap.mmap, "seekable"):
+                    bundle_source = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
                 else:
-                    self.display_log(f"WARNING: base.apk not found in {os.path.basename(downloaded_file_path)}. Extracted APKs: {', '.join(apk_files_in_archive)}", "orange")
-                    self.display_log("Consider using SAI (Split APKs Installer) or similar tools to install this multi-part APK if base.apk is missing.", "orange")
+                    bundle_source = bundle_file
+                try:
+                    with zipfile.ZipFile(bundle_source) as zip_ref:
+                        # Look for base.apk via the archive's name index
+                        # instead of rescanning the whole member list
+                        base_info = next(
+                            (info for name, info in zip_ref.NameToInfo.items()
+                             if name.endswith('.apk') and os.path.basename(name) == "base.apk"),
+                            None,
+                        )
+
+                        if base_info is not None:
+                            self.display_log(f"INFO: Extracting base.apk from {os.path.basename(downloaded_file_path)}...", "blue")
+                            # Stream the member straight to its destination
+                            # in 1 MiB chunks; extract() would also recreate
+                            # the archive's internal directory layout, which
+                            # we don't need
+                            extracted_base_apk_path = os.path.join(extraction_dir, "base.apk")
+                            with zip_ref.open(base_info) as src, open(extracted_base_apk_path, "wb") as dst:
+                                shutil.copyfileobj(src, dst, 1024 * 1024)
+                            self.display_log(f"SUCCESS: base.apk extracted to: {extracted_base_apk_path}", "#c0ffee")
+                        else:
+                            apk_files_in_archive = [name for name in zip_ref.namelist() if name.endswith('.apk')]
+                            self.display_log(f"WARNING: base.apk not found in {os.path.basename(downloaded_file_path)}. Extracted APKs: {', '.join(apk_files_in_archive)}", "orange")
+                            self.display_log("Consider using SAI (Split APKs Installer) or similar tools to install this multi-part APK if base.apk is missing.", "orange")
+                finally:
+                    if bundle_source is not bundle_file:
+                        bundle_source.close()
 
         except zipfile.BadZipFile:
             self.display_log(f"ERROR: Downloaded file {os.path.basename(downloaded_file_path)} is not a valid ZIP/APK archive.", "red")
@@ -1215,25 +1689,51 @@ class MainWindow(QWidget):
 
         remote_apk_full_path = self.last_extracted_apk_filename
 
+        # A size cached at extract time makes the pre-pull probe redundant
+        cached_size = self._apk_size_cache.get(remote_apk_full_path)
+        if cached_size:
+            self.total_download_size = cached_size
+            self.display_log(f"Remote APK size: {cached_size} bytes (cached)", "#c0ffee")
+            self._disable_all_buttons_and_inputs_during_operation()
+            self.download_progress_bar.setVisible(True)
+            self.download_progress_bar.setValue(0)
+            self._start_actual_apk_pull(remote_apk_full_path)
+            return
+
         # Get APK size from Android device first
         get_size_command = self._build_adb_command("get_apk_size", apk_path_or_package_name=remote_apk_full_path)
-        self.display_log(f"Attempting to get remote APK size: {get_size_command}", "#00face")
+        self.display_log(f"Attempting to get remote APK size: {_format_adb_command(get_size_command)}", "#00face")
 
         self._disable_all_buttons_and_inputs_during_operation()
         self.download_progress_bar.setVisible(True)
         self.download_progress_bar.setValue(0)
 
-        self.get_size_worker = WorkerThread(get_size_command)
-        self.get_size_worker.finished.connect(
+        # Start the probe first, then open the save dialog: the modal loop
+        # still delivers the probe result, so the adb round trip and the
+        # user's file-picker time overlap instead of adding up
+        self._pending_pull = {"remote": remote_apk_full_path, "local": None, "size_done": False}
+        self.adb_service.submit(
+            get_size_command,
             lambda stdout, stderr, returncode, time_taken:
-                self._on_apk_size_fetched(stdout, stderr, returncode, time_taken, remote_apk_full_path)
+                self._on_apk_size_fetched(stdout, stderr, returncode, time_taken, remote_apk_full_path),
+            self.on_worker_error
         )
-        self.get_size_worker.error.connect(self.on_worker_error)
-        self.get_size_worker.log_message.connect(self._handle_worker_log_message)
-        self.get_size_worker.start()
+
+        local_save_path = self._ask_download_destination(remote_apk_full_path)
+        if self._pending_pull is None:
+            # The probe failed while the dialog was open; UI already reset
+            return
+        if not local_save_path:
+            self._pending_pull = None
+            self.display_log("APK download cancelled by user.", "#f7f5de")
+            self._re_enable_all_buttons_and_inputs_after_operation()
+            self.download_progress_bar.setVisible(False)
+            self.download_progress_bar.setValue(0)
+            return
+        self._pending_pull["local"] = local_save_path
+        self._maybe_launch_pull()
 
     def _on_apk_size_fetched(self, stdout, stderr, returncode, time_taken, remote_apk_full_path):
-        self.get_size_worker = None # Remove reference after completion
         self.display_log("--- APK Size Output ---", "#f7f5de")
         if stdout:
             self.display_log(stdout, "black")
@@ -1242,22 +1742,58 @@ class MainWindow(QWidget):
 
         if returncode == 0 and stdout.strip().isdigit():
             self.total_download_size = int(stdout.strip())
+            self._apk_size_cache[remote_apk_full_path] = self.total_download_size
             self.display_log(f"Remote APK size: {self.total_download_size} bytes", "#c0ffee")
 
-            # Continue with actual download process
-            self._start_actual_apk_pull(remote_apk_full_path)
+            if self._pending_pull is not None:
+                self._pending_pull["size_done"] = True
+                self._maybe_launch_pull()
         else:
-            self.display_log(f"Failed to get remote APK size (code {returncode}). Error: {stderr}", "red")
+            self.display_log(f"Failed to get remote APK size (code {returncode}). Error: {stderr or stdout}", "red")
             self.display_log("Cannot proceed with download without knowing file size.", "red")
+            self._pending_pull = None
+            self._handle_possible_disconnect(stderr, stdout)
             self._re_enable_all_buttons_and_inputs_after_operation()
             self.download_progress_bar.setVisible(False)
             self.download_progress_bar.setValue(0)
 
 
-    def _start_actual_apk_pull(self, remote_apk_full_path):
-        # Get local save path from dialog
+    def _fetch_apk_sizes(self, apk_paths):
+        # Stat all paths in one device-shell round trip and cache the sizes
+        if not apk_paths:
+            return
+        sizes_command = self._build_adb_command("get_apk_sizes", apk_path_or_package_name=apk_paths)
+        self.adb_service.submit(
+            sizes_command,
+            lambda stdout, stderr, returncode, time_taken:
+                self._on_apk_sizes_fetched(stdout, returncode, apk_paths),
+        )
+
+    def _on_apk_sizes_fetched(self, stdout, returncode, apk_paths):
+        if returncode != 0:
+            return
+        sizes = stdout.split()
+        # stat keeps output order aligned with its arguments
+        for path, size in zip(apk_paths, sizes):
+            if size.isdigit():
+                self._apk_size_cache[path] = int(size)
+
+    def _ask_download_destination(self, remote_apk_full_path):
         default_filename = os.path.basename(remote_apk_full_path)
         local_save_path, _ = QFileDialog.getSaveFileName(self, "Save APK File", default_filename, "APK Files (*.apk);;All Files (*)")
+        return local_save_path
+
+    def _maybe_launch_pull(self):
+        # Fires once both the size probe and the save dialog have finished,
+        # in whichever order they complete
+        pending = self._pending_pull
+        if pending and pending["local"] and pending["size_done"]:
+            self._pending_pull = None
+            self._launch_apk_pull(pending["remote"], pending["local"])
+
+    def _start_actual_apk_pull(self, remote_apk_full_path):
+        # Get local save path from dialog
+        local_save_path = self._ask_download_destination(remote_apk_full_path)
 
         if not local_save_path:
             self.display_log("APK download cancelled by user.", "#f7f5de")
@@ -1266,37 +1802,37 @@ class MainWindow(QWidget):
             self.download_progress_bar.setValue(0)
             return
 
+        self._launch_apk_pull(remote_apk_full_path, local_save_path)
+
+    def _launch_apk_pull(self, remote_apk_full_path, local_save_path):
         self.current_local_download_path = local_save_path
+        # The denominator never changes during a transfer; format it once
+        self._total_mb = self.total_download_size / (1024 * 1024)
+        self._total_mb_str = f"{self._total_mb:.2f}MB"
 
         download_command = self._build_adb_command(
             "download_apk", apk_path_or_package_name=remote_apk_full_path, local_path=local_save_path
         )
 
-        self.display_log(f"Attempting to download APK: {download_command}", "#00face")
-
-        # Start progress timer
-        self.download_progress_timer.start()
+        self.display_log(f"Attempting to download APK: {' '.join(download_command)}", "#00face")
 
         self.download_worker = WorkerThread(download_command, is_download=True)
         self.download_worker.finished.connect(self.on_apk_download_finished)
+        self.download_worker.progress_update.connect(self._on_download_progress)
         self.download_worker.error.connect(self.on_worker_error)
         self.download_worker.log_message.connect(self._handle_worker_log_message)
         self.download_worker.start()
 
-    def _update_download_progress(self):
-        if self.current_local_download_path and os.path.exists(self.current_local_download_path) and self.total_download_size > 0:
-            current_size = os.path.getsize(self.current_local_download_path)
-            progress_percentage = int((current_size / self.total_download_size) * 100)
-            self.download_progress_bar.setValue(progress_percentage)
-            self.download_progress_bar.setFormat(f"Downloading: %p% - {current_size / (1024*1024):.2f}MB / {self.total_download_size / (1024*1024):.2f}MB")
-        elif not os.path.exists(self.current_local_download_path):
-            self.download_progress_bar.setValue(0)
-            self.download_progress_bar.setFormat("Downloading: 0% - File has not started...")
+    def _on_download_progress(self, percent):
+        # Driven by the percentages adb itself reports on its progress
+        # lines, so no filesystem polling is needed.
+        self.download_progress_bar.setValue(percent)
+        if self.total_download_size > 0:
+            downloaded_mb = self._total_mb * percent / 100
+            self.download_progress_bar.setFormat(f"Downloading: %p% - {downloaded_mb:.2f}MB / {self._total_mb_str}")
 
 
     def on_apk_download_finished(self, stdout, stderr, returncode, time_taken):
-        # Stop progress timer
-        self.download_progress_timer.stop()
         self.download_worker = None # Remove reference after completion
 
         self.display_log("--- APK Download Output ---", "#f7f5de")
@@ -1318,10 +1854,14 @@ class MainWindow(QWidget):
         else:
             self.display_log(f"APK download failed with code {returncode}.", "red")
             self.display_log("Please check if the APK file exists on Android and the path is correct.", "red")
-            if "no such file or directory" in stderr or "does not exist" in stderr:
+            # The streaming pull merges stderr into stdout, so adb's error
+            # text is in stdout; scan both streams lowercased once
+            errlow = f"{stdout}\n{stderr}".lower()
+            if any(token in errlow for token in _ADB_NOTFOUND_TOKENS):
                 self.display_log("APK file not found on Android at the specified path.", "red")
-            elif "Permission denied" in stderr:
+            elif "permission denied" in errlow:
                 self.display_log("Permission denied when accessing APK on Android.", "red")
+            self._handle_possible_disconnect(stderr, stdout)
 
         self.download_progress_bar.setVisible(False)
         self.download_progress_bar.setValue(0)
@@ -1338,18 +1878,18 @@ class MainWindow(QWidget):
         self.download_progress_bar.setValue(0)
         self.total_download_size = 0
         self.current_local_download_path = None
-        self.download_progress_timer.stop()
-        # Set semua worker references ke None pada error kritis untuk membantu garbage collection
-        self.tcpip_worker = None
-        self.connect_ip_worker = None
-        self.devices_worker = None
-        self.disconnect_worker = None
-        self.transfer_worker = None
-        self.execute_worker = None
-        self.apk_list_worker = None
-        self.get_size_worker = None
+        # Clear pending-state flags and the one remaining worker reference
+        self._connect_ip_pending = False
+        self._devices_check_pending = False
+        self._pending_pull = None
         self.download_worker = None
 
+    def closeEvent(self, event):
+        # Shut the adb service thread down cleanly on exit
+        self.adb_service.stop()
+        self.adb_service.wait(2000)
+        super().closeEvent(event)
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainWindow()